@@ -0,0 +1,314 @@
+"""
+api_server.py
+
+Local read-only HTTP/JSON API over queries.py, so applications can share one process
+(and one set of cached results) instead of each opening hockey.db themselves.
+
+Endpoints:
+- GET /players/<player_id>
+- GET /players/search?q=<text>&limit=<n>
+- GET /players/summary
+- GET /games/<game_id>
+- GET /standings
+
+Every successful response carries an ETag built from SQLite's file change counter,
+which the population scripts bump on every commit. Clients that send If-None-Match get
+a 304 for a resource that exists until the data changes, and rendered bodies are
+cached per data version so repeated requests do not rerun their query.
+
+Usage:
+    python -m database.api_server [--host 127.0.0.1] [--port 8080] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from database import queries as q
+
+# ---------------------------
+# Config
+# ---------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4
+GZIP_MIN_BYTES = 1024        # smaller bodies are not worth compressing
+CACHE_MAX_ENTRIES = 512
+MAX_HEADER_BYTES = 16 * 1024
+
+# ---------------------------
+# Database access
+# ---------------------------
+def data_version(db_path: str) -> int:
+    """
+    Reads the file change counter from the SQLite header (bytes 24-27).
+
+    SQLite increments it on every committed write in rollback-journal mode, which is
+    what the population scripts use, so it identifies the current state of the data.
+
+    Args:
+        db_path (str): Path to the database file.
+
+    Returns:
+        int: The file change counter.
+    """
+    with open(db_path, "rb") as f:
+        f.seek(24)
+        return int.from_bytes(f.read(4), "big")
+
+class ReadOnlyPool:
+    """Thread pool where each worker thread holds its own read-only connection."""
+
+    def __init__(self, db_path: str, workers: int):
+        self.db_path = db_path
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sqlite-read")
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    async def run(self, fn, *args):
+        """Runs fn(conn, *args) on a worker thread and returns its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: fn(self._connection(), *args))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+# ---------------------------
+# Routes
+# ---------------------------
+class NotFound(Exception):
+    """Raised by a route when the requested resource does not exist."""
+
+class BadRequest(Exception):
+    """Raised by a route when a query parameter is invalid."""
+
+def _int_param(params, name, default):
+    value = params.get(name, [str(default)])[0]
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer, got {value!r}")
+
+def _rows(rows):
+    return [dict(row) for row in rows]
+
+def player_route(conn, player_id):
+    row = q.get_player_by_id(conn, int(player_id))
+    if row is None:
+        raise NotFound(f"player {player_id}")
+    return {"player_id": int(player_id), **dict(row)}
+
+def player_search_route(conn, params):
+    text = params.get("q", [""])[0]
+    limit = _int_param(params, "limit", 10)
+    return _rows(q.search_players(conn, text, limit=limit))
+
+def player_summary_route(conn, params):
+    return _rows(q.get_all_player_summary_stats(conn))
+
+def game_route(conn, game_id):
+    box = q.get_game_box_score(conn, int(game_id))
+    if box is None:
+        raise NotFound(f"game {game_id}")
+    return {
+        "game": dict(box["game"]),
+        "skaters": _rows(box["skaters"]),
+        "goalies": _rows(box["goalies"]),
+        "goals": _rows(box["goals"]),
+    }
+
+def standings_route(conn, params):
+    return _rows(q.get_standings(conn))
+
+# Exact paths take the parsed query string; "/prefix/<id>" routes take the id.
+ROUTES = {
+    "/players/search": player_search_route,
+    "/players/summary": player_summary_route,
+    "/standings": standings_route,
+}
+ID_ROUTES = {
+    "/players/": player_route,
+    "/games/": game_route,
+}
+
+def resolve(target: str):
+    """
+    Maps a request target to a route function and its argument.
+
+    Returns:
+        Tuple: (fn, arg), or (None, None) if nothing matches.
+    """
+    parts = urlsplit(target)
+    if parts.path in ROUTES:
+        return ROUTES[parts.path], parse_qs(parts.query)
+    for prefix, fn in ID_ROUTES.items():
+        rest = parts.path[len(prefix):]
+        if parts.path.startswith(prefix) and rest.isdigit():
+            return fn, rest
+    return None, None
+
+# ---------------------------
+# HTTP server
+# ---------------------------
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header ("*" or a comma-separated list of tags)
+    against the current ETag.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+class ApiServer:
+    """Minimal HTTP/1.1 server (GET only, keep-alive) answering from a ReadOnlyPool."""
+
+    def __init__(self, db_path: str = q.DB_PATH, workers: int = DEFAULT_WORKERS):
+        self.db_path = db_path
+        self.pool = ReadOnlyPool(db_path, workers)
+        self._cache = {}      # (version, target) -> task resolving to (status, body, gzip body)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.send(writer, HTTPStatus.BAD_REQUEST, {}, b"", close=True)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                await self.respond(writer, method, target, headers, close)
+                if close:
+                    break
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, target, headers, close):
+        if method != "GET":
+            await self.send(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"Allow": "GET"}, b"", close)
+            return
+
+        version = data_version(self.db_path)
+        etag = f'W/"{version}"'
+        # Rendered first (usually a cache hit) so unknown paths and missing ids still 404.
+        status, body, body_gz = await self.render(version, target)
+        if status == HTTPStatus.OK and etag_matches(headers.get("if-none-match", ""), etag):
+            await self.send(writer, HTTPStatus.NOT_MODIFIED, {"ETag": etag, "Vary": "Accept-Encoding"}, b"", close)
+            return
+
+        extra = {"Content-Type": "application/json", "Vary": "Accept-Encoding"}
+        if status == HTTPStatus.OK:
+            extra["ETag"] = etag
+        if body_gz is not None and "gzip" in headers.get("accept-encoding", ""):
+            extra["Content-Encoding"] = "gzip"
+            body = body_gz
+        await self.send(writer, status, extra, body, close)
+
+    async def render(self, version, target):
+        """
+        Returns (status, body, gzipped body or None) for a target at a given data version.
+
+        Results are cached per version, and concurrent requests for the same uncached
+        target share a single query. Server errors are not cached, so the next request
+        tries again.
+        """
+        key = (version, target)
+        task = self._cache.get(key)
+        if task is None:
+            if len(self._cache) >= CACHE_MAX_ENTRIES:
+                self._cache.clear()
+            task = asyncio.ensure_future(self._render(target))
+            self._cache[key] = task
+        try:
+            return await task
+        except Exception as e:
+            if self._cache.get(key) is task:
+                self._cache.pop(key)
+            busy = isinstance(e, sqlite3.OperationalError) and ("locked" in str(e) or "busy" in str(e))
+            status = HTTPStatus.SERVICE_UNAVAILABLE if busy else HTTPStatus.INTERNAL_SERVER_ERROR
+            return status, json.dumps({"error": str(e)}).encode(), None
+
+    async def _render(self, target):
+        """Runs the route for target. Database errors propagate to render()."""
+        fn, arg = resolve(target)
+        if fn is None:
+            return HTTPStatus.NOT_FOUND, json.dumps({"error": "unknown endpoint"}).encode(), None
+        try:
+            result = await self.pool.run(fn, arg)
+        except NotFound as e:
+            return HTTPStatus.NOT_FOUND, json.dumps({"error": f"{e} not found"}).encode(), None
+        except BadRequest as e:
+            return HTTPStatus.BAD_REQUEST, json.dumps({"error": str(e)}).encode(), None
+
+        body = json.dumps(result).encode()
+        body_gz = gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+        return HTTPStatus.OK, body, body_gz
+
+    async def send(self, writer, status, headers, body, close):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        headers = {**headers, "Content-Length": str(len(body))}
+        if close:
+            headers["Connection"] = "close"
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Starts listening (port 0 picks a free port) and returns the asyncio server."""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        server = await self.start(host, port)
+        print(f"Serving {self.db_path} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.close()
+
+# ---------------------------
+# Main Function
+# ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Local read-only JSON API over hockey.db")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--db", default=q.DB_PATH)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+    try:
+        asyncio.run(ApiServer(args.db, args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
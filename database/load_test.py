@@ -0,0 +1,115 @@
+"""
+load_test.py
+
+Load test for api_server.py. Opens a number of keep-alive connections to a running
+server, requests a mix of endpoints for a fixed duration, and reports requests/sec
+and p50/p99 latency.
+
+Usage:
+    python -m database.api_server &
+    python -m database.load_test [--port 8080] [--connections 32] [--duration 10] [--revalidate]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+# A representative mix of endpoints; ids exist in the 20252026 data.
+DEFAULT_PATHS = [
+    "/players/8478402",
+    "/players/8477934",
+    "/players/search?q=mcdavid",
+    "/players/search?q=stutzle",
+    "/games/2025020121",
+    "/games/2025020006",
+    "/standings",
+    "/players/summary",
+]
+
+async def fetch(reader, writer, host, path, etag=None):
+    """
+    Sends one GET on a keep-alive connection and reads the full response.
+
+    Returns:
+        Tuple: (status code, ETag header or None)
+    """
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: gzip\r\n"
+    if etag:
+        request += f"If-None-Match: {etag}\r\n"
+    writer.write((request + "\r\n").encode("latin-1"))
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag")
+
+async def client(host, port, paths, deadline, latencies, statuses, revalidate):
+    """Runs requests on one connection until the deadline, recording latency per request."""
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        while time.perf_counter() < deadline:
+            path = random.choice(paths)
+            start = time.perf_counter()
+            status, etag = await fetch(reader, writer, host, path, etags.get(path) if revalidate else None)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+async def run(host, port, connections, duration, paths, revalidate):
+    # Warm the server's cache once so the run measures steady state.
+    reader, writer = await asyncio.open_connection(host, port)
+    for path in paths:
+        await fetch(reader, writer, host, path)
+    writer.close()
+
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, paths, deadline, latencies, statuses, revalidate)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.1f}s over {connections} connections")
+    print(f"requests/sec: {len(latencies) / elapsed:.0f}")
+    print(f"p50: {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"p99: {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running api_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--revalidate", action="store_true",
+                        help="send If-None-Match with the last ETag seen for each path")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.connections, args.duration, args.paths, args.revalidate))
+
+if __name__ == "__main__":
+    main()
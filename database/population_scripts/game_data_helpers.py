@@ -5,16 +5,20 @@ Shared helper functions for populating/updating NHL game data.
 """
 
 import sqlite3
+import os
+import re
 from nhlpy import NHLClient
 from enum import IntEnum
 import time
 import random
+from itertools import combinations
 from typing import List, Dict, Tuple
 
 # ---------------------------
 # Config
 # ---------------------------
 SEASON = "20252026"
+DDL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tables_ddl.sql")
 
 # ---------------------------
 # Utility
@@ -121,6 +125,233 @@ def ensure_player(cursor: sqlite3.Cursor, client: NHLClient, player_id: int):
          sweater, birth_country, headshot, player_id)
     )
 
+
+# ---------------------------
+# Schema
+# ---------------------------
+def ddl_statements(*names: str) -> List[str]:
+    """
+    Reads the CREATE statements for the named tables, virtual tables and triggers from
+    tables_ddl.sql, along with the indexes on those tables, in file order.
+
+    Args:
+        *names (str): Object names, e.g. "PlayerCombos".
+
+    Returns:
+        List[str]: The matching statements.
+    """
+    statements = []
+    pending = ""
+    with open(DDL_PATH) as f:
+        for line in f:
+            if not pending and (not line.strip() or line.lstrip().startswith("--")):
+                continue
+            pending += line
+            if not sqlite3.complete_statement(pending):
+                continue
+            match = re.match(r"\s*CREATE\s+(?:VIRTUAL\s+)?(TABLE|INDEX|TRIGGER)\s+(\w+)(?:\s+ON\s+(\w+))?", pending, re.I)
+            if match and (match.group(2) in names or (match.group(1).upper() == "INDEX" and match.group(3) in names)):
+                statements.append(pending.strip())
+            pending = ""
+    return statements
+
+def schema_matches(cursor: sqlite3.Cursor, statements: List[str]) -> bool:
+    """
+    Checks that every statement's object exists in the database with exactly that definition.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor.
+        statements (List[str]): Output of ddl_statements.
+
+    Returns:
+        bool: False if anything is missing or was created from an older tables_ddl.sql.
+    """
+    stored = {sql for (sql,) in cursor.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL")}
+    return all(statement.rstrip(";") in stored for statement in statements)
+
+# ---------------------------
+# Player Search Index
+# ---------------------------
+PLAYER_SEARCH_TABLES = ["PlayerSearch", "PlayerSearchName", "PlayerSearchTrigram", "PlayerSearchTrigramVocab"]
+PLAYER_SEARCH_TRIGGERS = ["player_search_name_ai", "players_search_ai", "players_search_au", "players_search_ad"]
+
+def ensure_player_search_index(cursor: sqlite3.Cursor):
+    """
+    Creates the PlayerSearch tables and triggers from tables_ddl.sql if they are missing
+    or differ from it (replacing an older layout) and loads the players already in the
+    database.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor.
+
+    Returns:
+        None
+    """
+    statements = ddl_statements(*PLAYER_SEARCH_TABLES, *PLAYER_SEARCH_TRIGGERS)
+    if schema_matches(cursor, statements):
+        return
+
+    for trigger in PLAYER_SEARCH_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for table in reversed(PLAYER_SEARCH_TABLES):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for statement in statements:
+        cursor.execute(statement)
+
+    cursor.execute(
+        """
+        INSERT INTO PlayerSearch (rowid, first_name, last_name, team)
+        SELECT
+            p.player_id, p.first_name, p.last_name,
+            COALESCE(p.current_team_abbrev, '') || ' ' || COALESCE(t.team_name, '')
+        FROM Players p
+        LEFT JOIN Teams t ON p.current_team_abbrev = t.team_abbrev
+        """
+    )
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO PlayerSearchName (name)
+        SELECT first_name FROM Players
+        UNION
+        SELECT last_name FROM Players
+        """
+    )
+
+# ---------------------------
+# Teammate Combos
+# ---------------------------
+STRENGTH_COLUMNS = {"ev": "ev_goals", "pp": "pp_goals", "sh": "sh_goals"}
+
+def build_combo_counts(
+    goal_rows: List[List], assist_rows: List[List], team_by_goal: Dict[str, str]
+) -> Dict[Tuple, Dict[str, int]]:
+    """
+    Counts the pairs and trios of teammates involved in each goal.
+
+    Args:
+        goal_rows (List[List]): Goal rows as built by process_goals_and_assists.
+        assist_rows (List[List]): Assist rows as built by process_goals_and_assists.
+        team_by_goal (Dict[str,str]): Mapping goal_id -> scoring team_abbrev.
+
+    Returns:
+        Dict[Tuple, Dict[str,int]]: (player_1, player_2, player_3, team_abbrev) -> column counts,
+            with player ids sorted and player_3 = 0 for pairs.
+    """
+    assists_by_goal = {}
+    for player_id, assist_type, goal_id in assist_rows:
+        assists_by_goal.setdefault(goal_id, {})[player_id] = assist_type
+
+    counts = {}
+    for goal in goal_rows:
+        goal_id, scorer, goal_type = goal[0], goal[2], goal[5]
+        assists = assists_by_goal.get(goal_id, {})
+        team = team_by_goal.get(goal_id)
+        if not assists or team is None:
+            continue
+
+        players = sorted({scorer, *assists})
+        for size in (2, 3):
+            for combo in combinations(players, size):
+                key = (*combo, 0) if size == 2 else combo
+                row = counts.setdefault(key + (team,), dict.fromkeys(
+                    ["goals", "primary_goals", "secondary_goals", *STRENGTH_COLUMNS.values()], 0
+                ))
+                row["goals"] += 1
+                if goal_type in STRENGTH_COLUMNS:
+                    row[STRENGTH_COLUMNS[goal_type]] += 1
+                if size == 2 and scorer in combo:
+                    other = combo[1] if combo[0] == scorer else combo[0]
+                    row[f"{assists[other]}_goals"] += 1
+    return counts
+
+def apply_combo_counts(cursor: sqlite3.Cursor, counts: Dict[Tuple, Dict[str, int]], sign: int = 1):
+    """
+    Adds (sign=1) or subtracts (sign=-1) combo counts in PlayerCombos.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor.
+        counts (Dict[Tuple, Dict[str,int]]): Output of build_combo_counts.
+        sign (int): 1 to add, -1 to subtract.
+
+    Returns:
+        None
+    """
+    cursor.executemany(
+        """
+        INSERT INTO PlayerCombos (
+            player_1, player_2, player_3, team_abbrev, goals,
+            primary_goals, secondary_goals, ev_goals, pp_goals, sh_goals
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (player_1, player_2, player_3, team_abbrev) DO UPDATE SET
+            goals = goals + excluded.goals,
+            primary_goals = primary_goals + excluded.primary_goals,
+            secondary_goals = secondary_goals + excluded.secondary_goals,
+            ev_goals = ev_goals + excluded.ev_goals,
+            pp_goals = pp_goals + excluded.pp_goals,
+            sh_goals = sh_goals + excluded.sh_goals
+        """,
+        [
+            (*key, *(sign * row[col] for col in
+                     ["goals", "primary_goals", "secondary_goals", *STRENGTH_COLUMNS.values()]))
+            for key, row in counts.items()
+        ]
+    )
+    if sign < 0:
+        cursor.execute("DELETE FROM PlayerCombos WHERE goals <= 0")
+
+def stored_game_combo_counts(cursor: sqlite3.Cursor, game_id=None) -> Dict[Tuple, Dict[str, int]]:
+    """
+    Builds combo counts from goals already stored in the database.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor.
+        game_id (int): Only count this game's goals (default: every game).
+
+    Returns:
+        Dict[Tuple, Dict[str,int]]: Same shape as build_combo_counts.
+    """
+    goal_rows = cursor.execute(
+        """
+        SELECT g.goal_id, g.game_id, g.player_id, g.period, g.time_in_period,
+               g.goal_type, g.goalie_id, g.video_link, s.team_abbrev
+        FROM Goals g
+        JOIN SkaterGameStats s ON s.player_id = g.player_id AND s.game_id = g.game_id
+        WHERE ? IS NULL OR g.game_id = ?
+        """,
+        (game_id, game_id)
+    ).fetchall()
+    assist_rows = cursor.execute(
+        """
+        SELECT a.player_id, a.assist_type, a.goal_id
+        FROM Assists a
+        JOIN Goals g ON a.goal_id = g.goal_id
+        WHERE ? IS NULL OR g.game_id = ?
+        """,
+        (game_id, game_id)
+    ).fetchall()
+
+    team_by_goal = {goal[0]: goal[8] for goal in goal_rows}
+    return build_combo_counts(goal_rows, assist_rows, team_by_goal)
+
+def ensure_player_combos(cursor: sqlite3.Cursor):
+    """
+    Creates PlayerCombos and its indexes from tables_ddl.sql if they are missing or differ
+    from it, and backfills the table from the stored goals.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor.
+
+    Returns:
+        None
+    """
+    statements = ddl_statements("PlayerCombos")
+    if schema_matches(cursor, statements):
+        return
+    cursor.execute("DROP TABLE IF EXISTS PlayerCombos")
+    for statement in statements:
+        cursor.execute(statement)
+    apply_combo_counts(cursor, stored_game_combo_counts(cursor))
+
 # ---------------------------
 # Game Processing
 # ---------------------------
@@ -309,6 +540,9 @@ def insert_game_data(
     Returns:
         None
     """
+    # Take back this game's combos from any earlier load before counting it again.
+    apply_combo_counts(cursor, stored_game_combo_counts(cursor, game_row[0]), sign=-1)
+
     cursor.execute(
         """
         INSERT OR REPLACE INTO Games (
@@ -359,3 +593,7 @@ def insert_game_data(
         """,
         goalie_rows
     )
+
+    team_by_player = {row[SkaterStat.PLAYER_ID]: row[SkaterStat.TEAM_ID] for row in skater_rows}
+    team_by_goal = {goal[0]: team_by_player.get(goal[2]) for goal in goal_rows}
+    apply_combo_counts(cursor, build_combo_counts(goal_rows, assist_rows, team_by_goal))
@@ -18,7 +18,9 @@ import time
 import os
 from datetime import date, timedelta
 from game_data_helpers import safe_call, build_game_row, build_skaters_and_goalies, \
-    process_play_by_play, process_goals_and_assists, SkaterStat, insert_game_data, SEASON
+    process_play_by_play, process_goals_and_assists, SkaterStat, insert_game_data, ensure_player_combos, SEASON, \
+    ensure_player_search_index
+from snapshot import build_snapshot
 
 CUTOFF_DATE =  (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
 
@@ -32,6 +34,8 @@ def main():
         DB_PATH = os.path.join(BASE_DIR, "database", "hockey.db")
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        ensure_player_search_index(cursor)
+        ensure_player_combos(cursor)
 
         # game_ids = client.helpers.game_ids_by_season(SEASON, [2])
         GAME_IDS_PATH = os.path.join(BASE_DIR, "database", "game_ids_20252026.json")
@@ -65,6 +69,8 @@ def main():
         """, ("game_update", CUTOFF_DATE))
         conn.commit()
 
+        build_snapshot(conn)
+
         conn.close()
 
     except Exception as e:
@@ -8,6 +8,7 @@ Uses SQLite and replaces existing entries if the player already exists.
 import sqlite3
 from nhlpy import NHLClient
 import os
+from game_data_helpers import ensure_player_search_index
 
 # Function to flatten roster
 def flatten_roster(roster, team_abbrev):
@@ -49,6 +50,7 @@ def main():
         DB_PATH = os.path.join(BASE_DIR, "database", "hockey.db")
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        ensure_player_search_index(cursor)
 
         teams = client.teams.teams()
         players = []
@@ -6,7 +6,9 @@ import random
 import os
 from datetime import date, timedelta
 from game_data_helpers import safe_call, build_game_row, build_skaters_and_goalies, \
-    process_play_by_play, process_goals_and_assists, SkaterStat, ensure_player, insert_game_data
+    process_play_by_play, process_goals_and_assists, SkaterStat, ensure_player, insert_game_data, \
+    ensure_player_combos, ensure_player_search_index
+from snapshot import build_snapshot
 
 def main():
     try:
@@ -16,6 +18,8 @@ def main():
         DB_PATH = os.path.join(BASE_DIR, "database", "hockey.db")
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        ensure_player_search_index(cursor)
+        ensure_player_combos(cursor)
 
         # Get all regular season games
         def process_game_for_date(sched_date):
@@ -55,6 +59,8 @@ def main():
             VALUES (?, ?)
         """, ("game_update", yesterday_date.strftime("%Y-%m-%d")))
         conn.commit()
+
+        build_snapshot(conn)
         
 
         conn.close()
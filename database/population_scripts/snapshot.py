@@ -0,0 +1,353 @@
+"""
+snapshot.py
+
+Columnar snapshot of the fact tables (Games, SkaterGameStats, GoalieGameStats, Goals,
+Assists) for fast in-process analysis.
+
+Each column is stored as its own .npy file, with players, teams and games encoded as
+small integer codes and dates as days since 1970-01-01. Every build goes into its own
+numbered directory under database/snapshot/ and the CURRENT file names the latest one.
+Loading memory-maps the files read-only, so several processes share the same pages and
+filter/group/aggregate runs on NumPy arrays instead of going through SQL.
+
+The game scripts rebuild the snapshot after each ingest. To build it by hand:
+    python snapshot.py
+"""
+
+import sqlite3
+import json
+import os
+import shutil
+import numpy as np
+from typing import List, Optional, Sequence
+
+try:
+    from .sql_expressions import TOI_SECONDS
+except ImportError:     # run as a script from population_scripts/
+    from sql_expressions import TOI_SECONDS
+
+# ---------------------------
+# Config
+# ---------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(BASE_DIR, "database", "hockey.db")
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "database", "snapshot")
+
+GOAL_TYPES = ["ev", "pp", "sh"]   # anything else is stored as -1
+
+# One query per table. player/team/game/goal_type are encoded after loading; date is
+# taken from Games so every table can be filtered by date without a join.
+TABLE_QUERIES = {
+    "games": """
+        SELECT game_id AS game, game_date AS date, home_team_abbrev AS home_team,
+               away_team_abbrev AS away_team, ot, shootout
+        FROM Games
+        ORDER BY game_id
+    """,
+    "skaters": f"""
+        SELECT s.player_id AS player, s.game_id AS game, s.team_abbrev AS team, gm.game_date AS date,
+               {TOI_SECONDS} AS toi_seconds,
+               s.faceoff_wins, s.faceoff_losses, s.hits, s.blocks, s.penalty_minutes, s.shots, s.plus_minus
+        FROM SkaterGameStats s
+        JOIN Games gm ON gm.game_id = s.game_id
+        ORDER BY s.game_id, s.player_id
+    """,
+    "goalies": """
+        SELECT gs.player_id AS player, gs.game_id AS game, gs.team_abbrev AS team, gm.game_date AS date,
+               gs.started, gs.saves, gs.goals_allowed, gs.shots_against
+        FROM GoalieGameStats gs
+        JOIN Games gm ON gm.game_id = gs.game_id
+        ORDER BY gs.game_id, gs.player_id
+    """,
+    "goals": """
+        SELECT g.player_id AS player, g.game_id AS game, s.team_abbrev AS team, gm.game_date AS date,
+               g.goal_type, g.period
+        FROM Goals g
+        JOIN Games gm ON gm.game_id = g.game_id
+        LEFT JOIN SkaterGameStats s ON s.player_id = g.player_id AND s.game_id = g.game_id
+        ORDER BY g.game_id, g.goal_id
+    """,
+    "assists": """
+        SELECT a.player_id AS player, g.game_id AS game, s.team_abbrev AS team, gm.game_date AS date,
+               g.goal_type, a.assist_type = 'primary' AS is_primary
+        FROM Assists a
+        JOIN Goals g ON g.goal_id = a.goal_id
+        JOIN Games gm ON gm.game_id = g.game_id
+        LEFT JOIN SkaterGameStats s ON s.player_id = a.player_id AND s.game_id = g.game_id
+        ORDER BY g.game_id, a.goal_id, a.player_id
+    """,
+}
+
+# ---------------------------
+# Build
+# ---------------------------
+def _encode(values: Sequence, keys: np.ndarray) -> np.ndarray:
+    """Maps each value to its index in the sorted keys array (-1 if missing)."""
+    values = np.asarray([-1 if v is None else v for v in values], dtype=np.int64)
+    codes = np.searchsorted(keys, values).astype(np.int32)
+    codes[(codes >= len(keys)) | (keys[np.minimum(codes, len(keys) - 1)] != values)] = -1
+    return codes
+
+def _current_version(path: str) -> Optional[str]:
+    """Returns the build directory name in path/CURRENT, or None if there is no snapshot yet."""
+    try:
+        with open(os.path.join(path, "CURRENT")) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def build_snapshot(conn: sqlite3.Connection, path: str = SNAPSHOT_PATH):
+    """
+    Reads the fact tables from the database and writes them as a columnar snapshot.
+
+    Each build is written to a new numbered directory and then published by replacing
+    the CURRENT file, so a Snapshot opened earlier keeps reading its own build. Builds
+    older than the previous one are removed.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        path (str): Snapshot directory.
+
+    Returns:
+        None
+    """
+    players = np.array(
+        [row[0] for row in conn.execute("SELECT player_id FROM Players ORDER BY player_id")],
+        dtype=np.int64
+    )
+    games = np.array(
+        [row[0] for row in conn.execute("SELECT game_id FROM Games ORDER BY game_id")],
+        dtype=np.int64
+    )
+    teams = [row[0] for row in conn.execute("SELECT team_abbrev FROM Teams ORDER BY team_abbrev")]
+    team_codes = {abbrev: i for i, abbrev in enumerate(teams)}
+    goal_type_codes = {goal_type: i for i, goal_type in enumerate(GOAL_TYPES)}
+
+    previous = _current_version(path)
+    version = str(int(previous) + 1) if previous else "1"
+    version_path = os.path.join(path, version)
+    tmp_path = version_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    meta = {"teams": teams, "goal_types": GOAL_TYPES, "tables": {}}
+    np.save(os.path.join(tmp_path, "players.npy"), players)
+    np.save(os.path.join(tmp_path, "games.npy"), games)
+
+    for table, query in TABLE_QUERIES.items():
+        cursor = conn.execute(query)
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        columns = dict(zip(names, zip(*rows))) if rows else {name: () for name in names}
+
+        arrays = {}
+        for name, values in columns.items():
+            if name == "player":
+                arrays[name] = _encode(values, players)
+            elif name == "game":
+                arrays[name] = _encode(values, games)
+            elif name in ("team", "home_team", "away_team"):
+                arrays[name] = np.array([team_codes.get(v, -1) for v in values], dtype=np.int16)
+            elif name == "goal_type":
+                arrays[name] = np.array([goal_type_codes.get(v, -1) for v in values], dtype=np.int8)
+            elif name == "date":
+                arrays[name] = np.array(values, dtype="datetime64[D]").astype(np.int32)
+            else:
+                arrays[name] = np.array([0 if v is None else v for v in values], dtype=np.int32)
+
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{table}.{name}.npy"), array)
+        meta["tables"][table] = {"rows": len(rows), "columns": list(arrays)}
+
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(version_path, ignore_errors=True)
+    os.rename(tmp_path, version_path)
+    with open(os.path.join(path, "CURRENT.tmp"), "w") as f:
+        f.write(version)
+    os.replace(os.path.join(path, "CURRENT.tmp"), os.path.join(path, "CURRENT"))
+
+    # Keep the previous build for readers that read CURRENT just before the swap.
+    # Files still mapped elsewhere may not be removable (Windows); a later build retries.
+    for name in os.listdir(path):
+        if name not in (version, previous, "CURRENT"):
+            entry = os.path.join(path, name)
+            if os.path.isdir(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                os.remove(entry)
+
+# ---------------------------
+# Query
+# ---------------------------
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot built by build_snapshot.
+
+    Every column of the current build is mapped when the Snapshot is created, so later
+    rebuilds never mix into an open Snapshot; create a new one to see new data.
+
+    Tables: games, skaters, goalies, goals, assists. Use column() for raw arrays or
+    aggregate() for filter/group/sum.
+    """
+
+    # Which group-by keys each table supports
+    GROUP_KEYS = {
+        "games": ("game",),
+        "skaters": ("player", "team", "game"),
+        "goalies": ("player", "team", "game"),
+        "goals": ("player", "team", "game"),
+        "assists": ("player", "team", "game"),
+    }
+
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        # A build finishing while we load may remove the directory CURRENT pointed at; reread it.
+        for attempt in range(3):
+            version = _current_version(path)
+            if version is None:
+                raise FileNotFoundError(f"No snapshot in {path}")
+            self.path = os.path.join(path, version)
+            try:
+                self._load()
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+        self.teams = self.meta["teams"]
+        self._team_codes = {abbrev: i for i, abbrev in enumerate(self.teams)}
+
+    def _load(self):
+        with open(os.path.join(self.path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.players = np.load(os.path.join(self.path, "players.npy"), mmap_mode="r")
+        self.games = np.load(os.path.join(self.path, "games.npy"), mmap_mode="r")
+        self._columns = {
+            (table, name): np.load(os.path.join(self.path, f"{table}.{name}.npy"), mmap_mode="r")
+            for table, info in self.meta["tables"].items()
+            for name in info["columns"]
+        }
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        """
+        Returns one column as a memory-mapped array.
+
+        Args:
+            table (str): Table name, e.g. "skaters".
+            name (str): Column name, e.g. "shots". player/game/team columns hold codes.
+
+        Returns:
+            np.ndarray: The column.
+        """
+        if (table, name) not in self._columns:
+            raise KeyError(f"{table}.{name} is not in the snapshot")
+        return self._columns[(table, name)]
+
+    def _date(self, value: str) -> int:
+        return int(np.datetime64(value, "D").astype(np.int32))
+
+    def mask(
+        self,
+        table: str,
+        player: Optional[int] = None,
+        team: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        goal_type: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Returns a boolean row mask for the given filters (all optional, combined with AND).
+
+        Args:
+            table (str): Table name.
+            player (int): NHL player ID.
+            team (str): Team abbreviation; for games, matches home or away.
+            start (str): First date to include, "YYYY-MM-DD".
+            end (str): Last date to include, "YYYY-MM-DD".
+            goal_type (str): "ev", "pp" or "sh" (goals and assists only).
+
+        Returns:
+            np.ndarray: Boolean mask over the table's rows.
+        """
+        result = np.ones(self.meta["tables"][table]["rows"], dtype=bool)
+        if player is not None:
+            code = int(np.searchsorted(self.players, player))
+            if code >= len(self.players) or self.players[code] != player:
+                return np.zeros_like(result)
+            result &= self.column(table, "player") == code
+        if team is not None:
+            code = self._team_codes.get(team, -2)
+            if table == "games":
+                result &= (self.column(table, "home_team") == code) | (self.column(table, "away_team") == code)
+            else:
+                result &= self.column(table, "team") == code
+        if start is not None:
+            result &= self.column(table, "date") >= self._date(start)
+        if end is not None:
+            result &= self.column(table, "date") <= self._date(end)
+        if goal_type is not None:
+            if goal_type not in self.meta["goal_types"]:
+                raise ValueError(f"Unknown goal_type: {goal_type}")
+            result &= self.column(table, "goal_type") == self.meta["goal_types"].index(goal_type)
+        return result
+
+    def aggregate(
+        self,
+        table: str,
+        by: Optional[str] = None,
+        metrics: Sequence[str] = ("count",),
+        **filters,
+    ) -> List:
+        """
+        Filters a table, groups it and sums the metric columns.
+
+        Args:
+            table (str): Table name.
+            by (str): "player", "team", "game" or None for a single total.
+            metrics (Sequence[str]): Columns to sum; "count" counts rows.
+            **filters: Passed to mask() (player, team, start, end, goal_type).
+
+        Returns:
+            List: With by=None, one tuple of metric totals. Otherwise (key, *metrics)
+                tuples sorted by the first metric, largest first, where key is the
+                player_id, team abbreviation or game_id.
+        """
+        if by is not None and by not in self.GROUP_KEYS[table]:
+            raise ValueError(f"{table} cannot be grouped by {by}")
+        rows = self.mask(table, **filters)
+
+        if by is None:
+            return [tuple(
+                int(rows.sum()) if m == "count" else int(self.column(table, m)[rows].sum())
+                for m in metrics
+            )]
+
+        codes = self.column(table, by)[rows]
+        valid = codes >= 0
+        codes = codes[valid]
+        size = {"player": len(self.players), "game": len(self.games), "team": len(self.teams)}[by]
+        sums = [
+            np.bincount(codes, minlength=size) if m == "count"
+            else np.bincount(codes, weights=self.column(table, m)[rows][valid], minlength=size)
+            for m in metrics
+        ]
+
+        present = np.flatnonzero(np.bincount(codes, minlength=size))
+        order = present[np.argsort(-sums[0][present], kind="stable")]
+        if by == "team":
+            keys = [self.teams[i] for i in order]
+        else:
+            keys = (self.players if by == "player" else self.games)[order].tolist()
+        return list(zip(keys, *(s[order].astype(np.int64).tolist() for s in sums)))
+
+# ---------------------------
+# Main Function
+# ---------------------------
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    build_snapshot(conn)
+    conn.close()
+    print(f"Snapshot written to {SNAPSHOT_PATH}")
+
+if __name__ == "__main__":
+    main()
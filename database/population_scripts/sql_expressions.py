@@ -0,0 +1,14 @@
+"""
+sql_expressions.py
+
+SQL expressions shared by the ingest side (snapshot.py) and the query layer
+(database/queries.py). No imports, so either side can use it without pulling in the other.
+"""
+
+# SkaterGameStats.toi (alias s) in seconds. toi is stored as "MM:SS" by the population scripts.
+TOI_SECONDS = """
+    CASE WHEN instr(s.toi, ':') > 0
+         THEN CAST(substr(s.toi, 1, instr(s.toi, ':') - 1) AS INTEGER) * 60
+              + CAST(substr(s.toi, instr(s.toi, ':') + 1) AS INTEGER)
+         ELSE CAST(s.toi AS INTEGER) END
+"""
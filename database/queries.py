@@ -1,6 +1,10 @@
 import sqlite3
 import os
+import re
+import difflib
+import unicodedata
 import pandas as pd
+from database.population_scripts.sql_expressions import TOI_SECONDS
 
 def get_connection(db_path="hockey.db"):
     """Return a connection to the SQLite database."""
@@ -17,10 +21,83 @@ def get_player_by_id(conn, player_id):
     """
     return conn.execute(query, (player_id,)).fetchone()
 
+# ---------------------------
+# Player name search
+# ---------------------------
+# PlayerSearch and PlayerSearchTrigram are created and kept in sync by
+# ensure_player_search_index in game_data_helpers.py (see tables_ddl.sql).
+# A word one typo away from a token keeps all but at most 3 of its trigrams, so it
+# contains at least one of the token's 4 rarest; only those are looked up.
+FUZZY_TRIGRAMS = 4
+FUZZY_CANDIDATES = 100    # names read per trigram
+
+def _fold(text):
+    """Lowercase and strip accents, matching the unicode61 remove_diacritics tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+def _close_terms(conn, token, n=3, cutoff=0.75):
+    """Return name words that are a near spelling of token (for typos like 'mcdavdi').
+    Candidates are the distinct names holding the token's rarest trigrams, at most
+    FUZZY_TRIGRAMS * FUZZY_CANDIDATES of them however many players are loaded.
+    """
+    trigrams = sorted({token[i:i + 3] for i in range(len(token) - 2)})
+    if not trigrams:
+        return []
+    counts = dict(conn.execute(
+        f"SELECT term, doc FROM PlayerSearchTrigramVocab WHERE term IN ({', '.join('?' * len(trigrams))});",
+        trigrams
+    ).fetchall())
+    # Trigrams no name contains count as the rarest but need no lookup.
+    rarest = sorted(trigrams, key=lambda gram: counts.get(gram, 0))[:FUZZY_TRIGRAMS]
+
+    words = set()
+    for gram in rarest:
+        if gram not in counts:
+            continue
+        rows = conn.execute(
+            "SELECT name FROM PlayerSearchTrigram WHERE PlayerSearchTrigram MATCH ? LIMIT ?;",
+            (f'"{gram}"', FUZZY_CANDIDATES)
+        )
+        words.update(word for (name,) in rows for word in re.findall(r"\w+", _fold(name)))
+    return difflib.get_close_matches(token, words, n=n, cutoff=cutoff)
+
+def search_players(conn, text, limit=10, fuzzy=True):
+    """Return player_id, first_name, last_name, current_team_abbrev for players matching text, best match first.
+    Each word is matched as a prefix against first name, last name and team ("conn mc", "stutzle", "oilers").
+    Accents are ignored. If fuzzy is True, words with no prefix match fall back to the closest spellings in the index.
+    Needs the PlayerSearch index, which the population scripts create (ensure_player_search_index).
+    """
+    tokens = re.findall(r"\w+", _fold(text))
+    if not tokens:
+        return []
+
+    groups = []
+    for token in tokens:
+        found = conn.execute(
+            "SELECT 1 FROM PlayerSearch WHERE PlayerSearch MATCH ? LIMIT 1;", (f'"{token}"*',)
+        ).fetchone()
+        if found is None and fuzzy:
+            alternatives = _close_terms(conn, token)
+            if alternatives:
+                groups.append("(" + " OR ".join(f'"{term}"' for term in alternatives) + ")")
+                continue
+        groups.append(f'"{token}"*')
+
+    query = """
+        SELECT p.player_id, p.first_name, p.last_name, p.current_team_abbrev
+        FROM PlayerSearch s
+        JOIN Players p ON p.player_id = s.rowid
+        WHERE PlayerSearch MATCH ?
+        ORDER BY bm25(PlayerSearch, 5.0, 10.0, 1.0)
+        LIMIT ?;
+    """
+    return conn.execute(query, (" AND ".join(groups), limit)).fetchall()
+
 def get_all_player_summary_stats(conn):
     """
     Return first_name, last_name, team_name, position, weight, height, games_played, goals, assists, power play goals, power play assists, short handed goals, short handed assists, penalty minutes, face off wins, face off losses, hattricks, shots on goal, hits, blocks
-    
+    Each source is totalled per player in its own subquery before joining, so no row is counted more than once.
     """
 
     query = """
@@ -31,69 +108,485 @@ def get_all_player_summary_stats(conn):
         p.position_code AS position,
         p.weight_lbs AS weight,
         p.height_inches AS height,
-        COUNT(DISTINCT s.game_id) AS games_played,
-        
+        COALESCE(s.games_played, 0) AS games_played,
+
         -- Goals breakdown
-        COUNT(DISTINCT g.goal_id) AS goals,
-        SUM(CASE WHEN a.goal_id IS NOT NULL THEN 1 ELSE 0 END) AS assists,
-        
-        SUM(CASE WHEN g.goal_type = 'powerplay' THEN 1 ELSE 0 END) AS power_play_goals,
-        SUM(CASE WHEN g.goal_type = 'short handed' THEN 1 ELSE 0 END) AS short_handed_goals,
-        
-        SUM(CASE WHEN g.goal_id IN (
-            SELECT goal_id
-            FROM Assists
-        ) AND g.goal_type = 'powerplay' THEN 1 ELSE 0 END) AS power_play_assists,
-        
-        SUM(CASE WHEN g.goal_id IN (
-            SELECT goal_id
-            FROM Assists
-        ) AND g.goal_type = 'short handed' THEN 1 ELSE 0 END) AS short_handed_assists,
-        
-        SUM(s.penalty_minutes) AS penalty_minutes,
-        SUM(s.faceoff_wins) AS faceoff_wins,
-        SUM(s.faceoff_losses) AS faceoff_losses,
-        
+        COALESCE(g.goals, 0) AS goals,
+        COALESCE(a.assists, 0) AS assists,
+
+        COALESCE(g.power_play_goals, 0) AS power_play_goals,
+        COALESCE(g.short_handed_goals, 0) AS short_handed_goals,
+        COALESCE(a.power_play_assists, 0) AS power_play_assists,
+        COALESCE(a.short_handed_assists, 0) AS short_handed_assists,
+
+        COALESCE(s.penalty_minutes, 0) AS penalty_minutes,
+        COALESCE(s.faceoff_wins, 0) AS faceoff_wins,
+        COALESCE(s.faceoff_losses, 0) AS faceoff_losses,
+
         -- Hattricks: 3+ goals in a game
-        SUM(CASE WHEN g_count.goals_in_game >= 3 THEN 1 ELSE 0 END) AS hattricks,
-        
-        SUM(s.shots) AS shots_on_goal,
-        SUM(s.hits) AS hits,
-        SUM(s.blocks) AS blocks
+        COALESCE(g.hattricks, 0) AS hattricks,
+
+        COALESCE(s.shots, 0) AS shots_on_goal,
+        COALESCE(s.hits, 0) AS hits,
+        COALESCE(s.blocks, 0) AS blocks
 
         FROM Players p
-        LEFT JOIN Teams t ON p.current_team_id = t.team_id
-        LEFT JOIN SkaterGameStats s ON p.player_id = s.player_id
-        LEFT JOIN Goals g ON p.player_id = g.player_id
+        LEFT JOIN Teams t ON p.current_team_abbrev = t.team_abbrev
         LEFT JOIN (
-            SELECT g.player_id, g.game_id, COUNT(*) AS goals_in_game
-            FROM Goals g
-            GROUP BY g.player_id, g.game_id
-        ) g_count ON p.player_id = g_count.player_id
-
-        LEFT JOIN Assists a ON g.goal_id = a.goal_id AND a.player_id = p.player_id
+            SELECT
+                player_id,
+                COUNT(*) AS games_played,
+                SUM(penalty_minutes) AS penalty_minutes,
+                SUM(faceoff_wins) AS faceoff_wins,
+                SUM(faceoff_losses) AS faceoff_losses,
+                SUM(shots) AS shots,
+                SUM(hits) AS hits,
+                SUM(blocks) AS blocks
+            FROM SkaterGameStats
+            GROUP BY player_id
+        ) s ON s.player_id = p.player_id
+        LEFT JOIN (
+            SELECT
+                player_id,
+                SUM(goals_in_game) AS goals,
+                SUM(pp_in_game) AS power_play_goals,
+                SUM(sh_in_game) AS short_handed_goals,
+                SUM(goals_in_game >= 3) AS hattricks
+            FROM (
+                SELECT player_id, game_id, COUNT(*) AS goals_in_game,
+                       SUM(goal_type = 'pp') AS pp_in_game, SUM(goal_type = 'sh') AS sh_in_game
+                FROM Goals
+                GROUP BY player_id, game_id
+            )
+            GROUP BY player_id
+        ) g ON g.player_id = p.player_id
+        LEFT JOIN (
+            SELECT
+                a.player_id,
+                COUNT(*) AS assists,
+                SUM(g.goal_type = 'pp') AS power_play_assists,
+                SUM(g.goal_type = 'sh') AS short_handed_assists
+            FROM Assists a
+            JOIN Goals g ON a.goal_id = g.goal_id
+            GROUP BY a.player_id
+        ) a ON a.player_id = p.player_id
 
-        WHERE position != 'G'
+        WHERE p.position_code != 'G'
 
-        GROUP BY p.player_id
         ORDER BY goals DESC, p.last_name, p.first_name;
 
     """
     cursor = conn.cursor()
     return cursor.execute(query, ()).fetchall()
 
+# ---------------------------
+# Game logs and rolling windows
+# ---------------------------
+# One row per skater per game, in game order. The {..._filter} slots are filled by
+# _skater_game_log_cte.
+SKATER_GAME_LOG_CTE = f"""
+    skater_log AS (
+        SELECT
+            s.player_id,
+            s.game_id,
+            gm.game_date,
+            s.team_abbrev,
+            CASE WHEN s.team_abbrev = gm.home_team_abbrev
+                 THEN gm.away_team_abbrev ELSE gm.home_team_abbrev END AS opponent,
+            COALESCE(gl.goals, 0) AS goals,
+            COALESCE(ast.assists, 0) AS assists,
+            COALESCE(gl.goals, 0) + COALESCE(ast.assists, 0) AS points,
+            s.shots,
+            {TOI_SECONDS} AS toi_seconds,
+            s.plus_minus,
+            s.hits,
+            s.blocks,
+            s.penalty_minutes
+        FROM SkaterGameStats s
+        JOIN Games gm ON s.game_id = gm.game_id
+        LEFT JOIN (
+            SELECT player_id, game_id, COUNT(*) AS goals
+            FROM Goals
+            {{goal_filter}}
+            GROUP BY player_id, game_id
+        ) gl ON gl.player_id = s.player_id AND gl.game_id = s.game_id
+        LEFT JOIN (
+            SELECT a.player_id, g.game_id, COUNT(*) AS assists
+            FROM Assists a
+            JOIN Goals g ON a.goal_id = g.goal_id
+            {{assist_filter}}
+            GROUP BY a.player_id, g.game_id
+        ) ast ON ast.player_id = s.player_id AND ast.game_id = s.game_id
+        {{skater_filter}}
+    )
+"""
+
+def _skater_game_log_cte(player_id=None):
+    """Return the skater_log CTE and its parameters.
+    Given a player_id, each source is filtered before aggregating, so only that player's rows are read.
+    """
+    if player_id is None:
+        return SKATER_GAME_LOG_CTE.format(goal_filter="", assist_filter="", skater_filter=""), ()
+    cte = SKATER_GAME_LOG_CTE.format(
+        goal_filter="WHERE player_id = ?",
+        assist_filter="WHERE a.player_id = ?",
+        skater_filter="WHERE s.player_id = ?",
+    )
+    return cte, (player_id, player_id, player_id)
+
+def get_skater_game_logs(conn, player_id=None):
+    """
+    Return every skater game in order (by player, then game date):
+    player_id, game_id, game_date, team_abbrev, opponent, goals, assists, points, shots, toi_seconds, plus_minus, hits, blocks, penalty_minutes
+    Args: player_id = only return this player's games (default: all players)
+    """
+    cte, params = _skater_game_log_cte(player_id)
+    query = f"""
+        WITH {cte}
+        SELECT *
+        FROM skater_log
+        ORDER BY player_id, game_date, game_id;
+    """
+    return conn.execute(query, params).fetchall()
+
+def get_skater_rolling_stats(conn, window=10, player_id=None, latest_only=False):
+    """
+    Return rolling totals over each skater's last `window` games, computed for all players in one pass:
+    player_id, game_id, game_date, games_in_window, goals, assists, points, shots, avg_toi_seconds, plus_minus
+    Args: window = number of games in the window
+          player_id = only return this player's rows (default: all players)
+          latest_only = only return each player's most recent window, sorted by points (a "last N games" leaderboard).
+                        Players with fewer than `window` games are left out so partial windows are not ranked.
+    """
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    cte, params = _skater_game_log_cte(player_id)
+    if latest_only:
+        where, order = "WHERE games_ago = 1 AND games_in_window = ?", "points DESC, goals DESC, player_id"
+        params += (window - 1, window)
+    else:
+        where, order = "", "player_id, game_date, game_id"
+        params += (window - 1,)
+    query = f"""
+        WITH {cte},
+        rolling AS (
+            SELECT
+                player_id,
+                game_id,
+                game_date,
+                COUNT(*) OVER w AS games_in_window,
+                SUM(goals) OVER w AS goals,
+                SUM(assists) OVER w AS assists,
+                SUM(points) OVER w AS points,
+                SUM(shots) OVER w AS shots,
+                AVG(toi_seconds) OVER w AS avg_toi_seconds,
+                SUM(plus_minus) OVER w AS plus_minus,
+                ROW_NUMBER() OVER (
+                    PARTITION BY player_id ORDER BY game_date DESC, game_id DESC
+                ) AS games_ago
+            FROM skater_log
+            WINDOW w AS (
+                PARTITION BY player_id ORDER BY game_date, game_id
+                ROWS BETWEEN ? PRECEDING AND CURRENT ROW
+            )
+        )
+        SELECT player_id, game_id, game_date, games_in_window, goals, assists, points, shots, avg_toi_seconds, plus_minus
+        FROM rolling
+        {where}
+        ORDER BY {order};
+    """
+    return conn.execute(query, params).fetchall()
+
+def get_goalie_game_logs(conn, player_id=None):
+    """
+    Return every goalie game in order (by player, then game date):
+    player_id, game_id, game_date, team_abbrev, opponent, started, saves, goals_allowed, shots_against
+    Args: player_id = only return this goalie's games (default: all goalies)
+    """
+    where, params = ("", ()) if player_id is None else ("WHERE gs.player_id = ?", (player_id,))
+    query = f"""
+        SELECT
+            gs.player_id,
+            gs.game_id,
+            gm.game_date,
+            gs.team_abbrev,
+            CASE WHEN gs.team_abbrev = gm.home_team_abbrev
+                 THEN gm.away_team_abbrev ELSE gm.home_team_abbrev END AS opponent,
+            gs.started,
+            gs.saves,
+            gs.goals_allowed,
+            gs.shots_against
+        FROM GoalieGameStats gs
+        JOIN Games gm ON gs.game_id = gm.game_id
+        {where}
+        ORDER BY gs.player_id, gm.game_date, gs.game_id;
+    """
+    return conn.execute(query, params).fetchall()
+
+def get_goalie_rolling_stats(conn, window=5, player_id=None, starts_only=True, latest_only=False):
+    """
+    Return rolling totals over each goalie's last `window` games, computed for all goalies in one pass:
+    player_id, game_id, game_date, games_in_window, saves, goals_allowed, shots_against, save_pct
+    Args: window = number of games in the window
+          player_id = only return this goalie's rows (default: all goalies)
+          starts_only = only count games the goalie started (relief appearances are skipped)
+          latest_only = only return each goalie's most recent window, sorted by save_pct.
+                        Goalies with fewer than `window` games are left out so partial windows are not ranked.
+    """
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    filters, params = [], []
+    if player_id is not None:
+        filters.append("gs.player_id = ?")
+        params.append(player_id)
+    if starts_only:
+        filters.append("gs.started = 1")
+    params.append(window - 1)
+    if latest_only:
+        where, order = "WHERE games_ago = 1 AND games_in_window = ?", "COALESCE(save_pct, 0) DESC, player_id"
+        params.append(window)
+    else:
+        where, order = "", "player_id, game_date, game_id"
+    query = f"""
+        WITH rolling AS (
+            SELECT
+                gs.player_id,
+                gs.game_id,
+                gm.game_date,
+                COUNT(*) OVER w AS games_in_window,
+                SUM(gs.saves) OVER w AS saves,
+                SUM(gs.goals_allowed) OVER w AS goals_allowed,
+                SUM(gs.shots_against) OVER w AS shots_against,
+                ROW_NUMBER() OVER (
+                    PARTITION BY gs.player_id ORDER BY gm.game_date DESC, gs.game_id DESC
+                ) AS games_ago
+            FROM GoalieGameStats gs
+            JOIN Games gm ON gs.game_id = gm.game_id
+            {"WHERE " + " AND ".join(filters) if filters else ""}
+            WINDOW w AS (
+                PARTITION BY gs.player_id ORDER BY gm.game_date, gs.game_id
+                ROWS BETWEEN ? PRECEDING AND CURRENT ROW
+            )
+        )
+        SELECT
+            player_id, game_id, game_date, games_in_window, saves, goals_allowed, shots_against,
+            CAST(saves AS REAL) / NULLIF(shots_against, 0) AS save_pct
+        FROM rolling
+        {where}
+        ORDER BY {order};
+    """
+    return conn.execute(query, params).fetchall()
+
+
+# ---------------------------
+# Box scores and standings
+# ---------------------------
+# Goals has no team column, so a goal's team comes from the scorer's SkaterGameStats
+# row for that game. A shootout winner is recorded as a single period 5 goal, which
+# matches the official final score.
+TEAM_GOALS_CTE = """
+    team_goals AS (
+        SELECT g.game_id, s.team_abbrev, COUNT(*) AS goals
+        FROM Goals g
+        JOIN SkaterGameStats s ON s.player_id = g.player_id AND s.game_id = g.game_id
+        GROUP BY g.game_id, s.team_abbrev
+    )
+"""
+
+def get_game_box_score(conn, game_id):
+    """
+    Return the box score for one game as a dict, or None if the game is not in the database:
+    game = game_id, game_date, home_team_abbrev, away_team_abbrev, home_goals, away_goals, ot, shootout
+    skaters = player_id, first_name, last_name, team_abbrev, goals, assists, shots, toi, plus_minus, hits, blocks, penalty_minutes
+    goalies = player_id, first_name, last_name, team_abbrev, started, saves, goals_allowed, shots_against
+    goals = goal_id, period, time_in_period, goal_type, player_id, first_name, last_name, team_abbrev
+    """
+    game = conn.execute(f"""
+        WITH {TEAM_GOALS_CTE}
+        SELECT
+            gm.game_id, gm.game_date, gm.home_team_abbrev, gm.away_team_abbrev,
+            COALESCE(hg.goals, 0) AS home_goals,
+            COALESCE(ag.goals, 0) AS away_goals,
+            gm.ot, gm.shootout
+        FROM Games gm
+        LEFT JOIN team_goals hg ON hg.game_id = gm.game_id AND hg.team_abbrev = gm.home_team_abbrev
+        LEFT JOIN team_goals ag ON ag.game_id = gm.game_id AND ag.team_abbrev = gm.away_team_abbrev
+        WHERE gm.game_id = ?;
+    """, (game_id,)).fetchone()
+    if game is None:
+        return None
+
+    skaters = conn.execute("""
+        SELECT
+            s.player_id, p.first_name, p.last_name, s.team_abbrev,
+            (SELECT COUNT(*) FROM Goals g
+             WHERE g.game_id = s.game_id AND g.player_id = s.player_id) AS goals,
+            (SELECT COUNT(*) FROM Assists a JOIN Goals g ON a.goal_id = g.goal_id
+             WHERE g.game_id = s.game_id AND a.player_id = s.player_id) AS assists,
+            s.shots, s.toi, s.plus_minus, s.hits, s.blocks, s.penalty_minutes
+        FROM SkaterGameStats s
+        JOIN Players p ON p.player_id = s.player_id
+        WHERE s.game_id = ?
+        ORDER BY s.team_abbrev, p.last_name, p.first_name;
+    """, (game_id,)).fetchall()
+
+    goalies = conn.execute("""
+        SELECT
+            gs.player_id, p.first_name, p.last_name, gs.team_abbrev,
+            gs.started, gs.saves, gs.goals_allowed, gs.shots_against
+        FROM GoalieGameStats gs
+        JOIN Players p ON p.player_id = gs.player_id
+        WHERE gs.game_id = ?
+        ORDER BY gs.team_abbrev, gs.started DESC;
+    """, (game_id,)).fetchall()
+
+    goals = conn.execute("""
+        SELECT
+            g.goal_id, g.period, g.time_in_period, g.goal_type,
+            g.player_id, p.first_name, p.last_name, s.team_abbrev
+        FROM Goals g
+        JOIN Players p ON p.player_id = g.player_id
+        LEFT JOIN SkaterGameStats s ON s.player_id = g.player_id AND s.game_id = g.game_id
+        WHERE g.game_id = ?
+        ORDER BY g.period, g.time_in_period;
+    """, (game_id,)).fetchall()
+
+    return {"game": game, "skaters": skaters, "goalies": goalies, "goals": goals}
+
+def get_standings(conn):
+    """
+    Return league standings, best record first:
+    team_abbrev, team_name, conference, division, games_played, wins, losses, ot_losses, points, goals_for, goals_against
+    Overtime and shootout losses count as ot_losses (one point).
+    """
+    query = f"""
+        WITH {TEAM_GOALS_CTE},
+        results AS (
+            SELECT
+                side.team_abbrev,
+                gm.ot,
+                COALESCE(tg.goals, 0) AS goals_for,
+                COALESCE(og.goals, 0) AS goals_against
+            FROM Games gm
+            JOIN (
+                SELECT game_id, home_team_abbrev AS team_abbrev, away_team_abbrev AS opponent FROM Games
+                UNION ALL
+                SELECT game_id, away_team_abbrev, home_team_abbrev FROM Games
+            ) side ON side.game_id = gm.game_id
+            LEFT JOIN team_goals tg ON tg.game_id = gm.game_id AND tg.team_abbrev = side.team_abbrev
+            LEFT JOIN team_goals og ON og.game_id = gm.game_id AND og.team_abbrev = side.opponent
+        )
+        SELECT
+            t.team_abbrev,
+            t.team_name,
+            t.conference,
+            t.division,
+            COUNT(*) AS games_played,
+            SUM(r.goals_for > r.goals_against) AS wins,
+            SUM(r.goals_for < r.goals_against AND NOT r.ot) AS losses,
+            SUM(r.goals_for < r.goals_against AND r.ot) AS ot_losses,
+            2 * SUM(r.goals_for > r.goals_against) + SUM(r.goals_for < r.goals_against AND r.ot) AS points,
+            SUM(r.goals_for) AS goals_for,
+            SUM(r.goals_against) AS goals_against
+        FROM results r
+        JOIN Teams t ON t.team_abbrev = r.team_abbrev
+        GROUP BY t.team_abbrev
+        ORDER BY points DESC, wins DESC, goals_for - goals_against DESC, t.team_abbrev;
+    """
+    return conn.execute(query).fetchall()
+
+
+# ---------------------------
+# Teammate combos
+# ---------------------------
+# PlayerCombos is maintained by insert_game_data (see game_data_helpers.py).
+COMBO_COLUMNS = """
+    c.player_1, p1.first_name || ' ' || p1.last_name AS player_1_name,
+    c.player_2, p2.first_name || ' ' || p2.last_name AS player_2_name,
+    NULLIF(c.player_3, 0) AS player_3, p3.first_name || ' ' || p3.last_name AS player_3_name,
+    c.team_abbrev, c.goals, c.primary_goals, c.secondary_goals, c.ev_goals, c.pp_goals, c.sh_goals
+"""
+COMBO_JOINS = """
+    JOIN Players p1 ON p1.player_id = c.player_1
+    JOIN Players p2 ON p2.player_id = c.player_2
+    LEFT JOIN Players p3 ON p3.player_id = c.player_3
+"""
+
+# Both lookups read one key and size straight off an index in this order.
+COMBO_ORDER = "goals DESC, primary_goals DESC"
+
+def _top_combos_query(team_abbrev=None, size=2, limit=10):
+    """Return the SQL and parameters for get_top_combos."""
+    if team_abbrev is None:
+        where, params = "c.size = ?", (size, limit)
+    else:
+        where, params = "c.team_abbrev = ? AND c.size = ?", (team_abbrev, size, limit)
+    query = f"""
+        SELECT {COMBO_COLUMNS}
+        FROM PlayerCombos c
+        {COMBO_JOINS}
+        WHERE {where}
+        ORDER BY c.goals DESC, c.primary_goals DESC
+        LIMIT ?;
+    """
+    return query, params
+
+def get_top_combos(conn, team_abbrev=None, size=2, limit=10):
+    """
+    Return the pairs (size=2) or trios (size=3) of teammates who were on the scoresheet together most often:
+    player_1, player_1_name, player_2, player_2_name, player_3, player_3_name, team_abbrev, goals, primary_goals, secondary_goals, ev_goals, pp_goals, sh_goals
+    player_3 is None for pairs. primary_goals/secondary_goals count goals where one of the pair scored and the other had that assist.
+    Args: team_abbrev = only this team's combos (default: whole league)
+    """
+    return conn.execute(*_top_combos_query(team_abbrev, size, limit)).fetchall()
+
+def _player_combos_query(player_id, size=2, limit=10):
+    """Return the SQL and parameters for get_player_combos.
+    The player can be in any of the three slots, so each slot is its own index lookup
+    (at most `limit` rows each) and the results are merged.
+    """
+    slots = ["player_1", "player_2"] + (["player_3"] if size == 3 else [])
+    lookups = " UNION ALL ".join(
+        f"""SELECT * FROM (
+                SELECT rowid AS combo_id, goals, primary_goals FROM PlayerCombos
+                WHERE {slot} = ? AND size = ?
+                ORDER BY {COMBO_ORDER}
+                LIMIT ?
+            )"""
+        for slot in slots
+    )
+    query = f"""
+        SELECT {COMBO_COLUMNS}
+        FROM (
+            SELECT combo_id FROM ({lookups})
+            ORDER BY {COMBO_ORDER}
+            LIMIT ?
+        ) top
+        JOIN PlayerCombos c ON c.rowid = top.combo_id
+        {COMBO_JOINS}
+        ORDER BY c.goals DESC, c.primary_goals DESC;
+    """
+    return query, (player_id, size, limit) * len(slots) + (limit,)
+
+def get_player_combos(conn, player_id, size=2, limit=10):
+    """
+    Return the teammates a player combined with most often, same columns and order as get_top_combos.
+    Args: size = 2 for linemates, 3 for trios
+    """
+    return conn.execute(*_player_combos_query(player_id, size, limit)).fetchall()
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "database", "hockey.db")
-conn = get_connection(DB_PATH)
 
+if __name__ == "__main__":
+    conn = get_connection(DB_PATH)
 
-tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
 
-print(tables)
+    print(tables)
 
-players = (get_all_player_summary_stats(conn))
-df = pd.DataFrame(players)
-df.to_csv("players.csv")
+    players = (get_all_player_summary_stats(conn))
+    df = pd.DataFrame(players)
+    df.to_csv("players.csv")
 
-conn.close()
\ No newline at end of file
+    conn.close()
@@ -49,6 +49,7 @@ CREATE TABLE Goals (
     FOREIGN KEY (player_id) REFERENCES Players(player_id),
     FOREIGN KEY (goalie_id) REFERENCES Players(player_id)
 );
+CREATE INDEX idx_goals_player ON Goals (player_id, game_id);
 
 CREATE TABLE Assists (
     player_id INTEGER NOT NULL,
@@ -83,7 +84,8 @@ CREATE TABLE GoalieGameStats (
     saves INTEGER,
     goals_allowed INTEGER,
     shots_against INTEGER,
-    PRIMARY KEY (player_id, game_id), team_abbrev TEXT,
+    team_abbrev TEXT,
+    PRIMARY KEY (player_id, game_id),
     FOREIGN KEY (player_id) REFERENCES Players(player_id),
     FOREIGN KEY (game_id) REFERENCES Games(game_id),
     FOREIGN KEY (team_abbrev) REFERENCES Teams(team_abbrev)
@@ -93,3 +95,86 @@ CREATE TABLE LastUpdate (
     update_type TEXT PRIMARY KEY,
     last_date TEXT
 );
+
+-- Teammates who combined on goals, maintained by insert_game_data.
+CREATE TABLE PlayerCombos (
+    player_1 INTEGER NOT NULL,        -- player ids sorted ascending
+    player_2 INTEGER NOT NULL,
+    player_3 INTEGER NOT NULL DEFAULT 0,  -- 0 for pairs
+    team_abbrev TEXT NOT NULL,
+    goals INTEGER NOT NULL DEFAULT 0,
+    primary_goals INTEGER NOT NULL DEFAULT 0,    -- pair only: one scored, the other had the primary assist
+    secondary_goals INTEGER NOT NULL DEFAULT 0,  -- pair only: one scored, the other had the secondary assist
+    ev_goals INTEGER NOT NULL DEFAULT 0,
+    pp_goals INTEGER NOT NULL DEFAULT 0,
+    sh_goals INTEGER NOT NULL DEFAULT 0,
+    size INTEGER GENERATED ALWAYS AS (CASE WHEN player_3 = 0 THEN 2 ELSE 3 END) VIRTUAL,  -- 2 or 3 players
+    PRIMARY KEY (player_1, player_2, player_3, team_abbrev),
+    FOREIGN KEY (team_abbrev) REFERENCES Teams(team_abbrev)
+);
+-- Every lookup is "one key, one size, most goals first", read straight off an index.
+CREATE INDEX idx_player_combos_team ON PlayerCombos (team_abbrev, size, goals DESC, primary_goals DESC);
+CREATE INDEX idx_player_combos_size ON PlayerCombos (size, goals DESC, primary_goals DESC);
+CREATE INDEX idx_player_combos_player_1 ON PlayerCombos (player_1, size, goals DESC, primary_goals DESC);
+CREATE INDEX idx_player_combos_player_2 ON PlayerCombos (player_2, size, goals DESC, primary_goals DESC);
+CREATE INDEX idx_player_combos_player_3 ON PlayerCombos (player_3, size, goals DESC, primary_goals DESC);
+
+
+-- Full-text name search over Players, kept in sync by the triggers below.
+-- rowid is the player_id; diacritics are folded so "Stutzle" finds "Stützle".
+CREATE VIRTUAL TABLE PlayerSearch USING fts5(
+    first_name,
+    last_name,
+    team,                              -- "<abbrev> <team_name>"
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Distinct first and last names, split into trigrams to find near spellings. Names
+-- are only ever added, so the trigram index grows with the number of distinct names,
+-- not players; a stale name just finds no one in PlayerSearch.
+CREATE TABLE PlayerSearchName (
+    name_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE VIRTUAL TABLE PlayerSearchTrigram USING fts5(
+    name,
+    content = 'PlayerSearchName',
+    content_rowid = 'name_id',
+    tokenize = 'trigram'
+);
+
+-- Number of names containing each trigram, so lookups can start from the rarest.
+CREATE VIRTUAL TABLE PlayerSearchTrigramVocab USING fts5vocab(PlayerSearchTrigram, 'row');
+
+CREATE TRIGGER player_search_name_ai AFTER INSERT ON PlayerSearchName BEGIN
+    INSERT INTO PlayerSearchTrigram (rowid, name) VALUES (NEW.name_id, NEW.name);
+END;
+
+-- INSERT OR REPLACE by rowid: populatePlayers.py upserts with INSERT OR REPLACE,
+-- which does not fire the delete trigger.
+CREATE TRIGGER players_search_ai AFTER INSERT ON Players BEGIN
+    INSERT OR REPLACE INTO PlayerSearch (rowid, first_name, last_name, team)
+    VALUES (
+        NEW.player_id, NEW.first_name, NEW.last_name,
+        COALESCE(NEW.current_team_abbrev, '') || ' ' ||
+        COALESCE((SELECT team_name FROM Teams WHERE team_abbrev = NEW.current_team_abbrev), '')
+    );
+    INSERT OR IGNORE INTO PlayerSearchName (name) VALUES (NEW.first_name), (NEW.last_name);
+END;
+
+CREATE TRIGGER players_search_au AFTER UPDATE ON Players BEGIN
+    DELETE FROM PlayerSearch WHERE rowid = OLD.player_id;
+    INSERT OR REPLACE INTO PlayerSearch (rowid, first_name, last_name, team)
+    VALUES (
+        NEW.player_id, NEW.first_name, NEW.last_name,
+        COALESCE(NEW.current_team_abbrev, '') || ' ' ||
+        COALESCE((SELECT team_name FROM Teams WHERE team_abbrev = NEW.current_team_abbrev), '')
+    );
+    INSERT OR IGNORE INTO PlayerSearchName (name) VALUES (NEW.first_name), (NEW.last_name);
+END;
+
+CREATE TRIGGER players_search_ad AFTER DELETE ON Players BEGIN
+    DELETE FROM PlayerSearch WHERE rowid = OLD.player_id;
+END;
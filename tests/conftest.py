@@ -0,0 +1,26 @@
+import os
+import sqlite3
+import pytest
+
+DDL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "tables_ddl.sql")
+
+
+@pytest.fixture
+def test_db():
+    """In-memory database built from tables_ddl.sql."""
+    db = sqlite3.connect(":memory:")
+    with open(DDL_PATH) as f:
+        db.executescript(f.read())
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def test_db_path(tmp_path):
+    """Path to an on-disk database built from tables_ddl.sql, for code that opens its own connections."""
+    path = str(tmp_path / "hockey.db")
+    db = sqlite3.connect(path)
+    with open(DDL_PATH) as f:
+        db.executescript(f.read())
+    db.close()
+    return path
@@ -0,0 +1,109 @@
+import asyncio
+import gzip
+import json
+import sqlite3
+from http import HTTPStatus
+
+from database.api_server import ApiServer, data_version, etag_matches
+
+
+def test_render_status_codes(test_db_path):
+    path = test_db_path
+    db = sqlite3.connect(path)
+    db.execute("INSERT INTO Players (player_id, first_name, last_name) VALUES (8478402, 'Connor', 'McDavid')")
+    db.commit()
+
+    async def run():
+        server = ApiServer(path, workers=1)
+        version = data_version(path)
+        try:
+            status, body, _ = await server.render(version, "/players/8478402")
+            assert status == HTTPStatus.OK
+            assert json.loads(body)["last_name"] == "McDavid"
+
+            assert (await server.render(version, "/players/1"))[0] == HTTPStatus.NOT_FOUND
+            assert (await server.render(version, "/players/search?q=mc&limit=x"))[0] == HTTPStatus.BAD_REQUEST
+
+            # A database fault is a server error and is not cached for this data version
+            db.execute("DROP TABLE PlayerSearch")
+            db.commit()
+            version = data_version(path)
+            status, body, _ = await server.render(version, "/players/search?q=mcdavid")
+            assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+            assert (version, "/players/search?q=mcdavid") not in server._cache
+        finally:
+            server.pool.close()
+
+    asyncio.run(run())
+    db.close()
+
+
+def test_etag_matches():
+    assert etag_matches('W/"7"', 'W/"7"')
+    assert etag_matches('"7"', 'W/"7"')
+    assert etag_matches('W/"6", W/"7"', 'W/"7"')
+    assert etag_matches('*', 'W/"7"')
+    assert not etag_matches('W/"6"', 'W/"7"')
+    assert not etag_matches('', 'W/"7"')
+
+
+async def request(reader, writer, path, headers=None):
+    """Sends one GET on an open connection; returns (status, headers, body)."""
+    lines = [f"GET {path} HTTP/1.1", "Host: test"] + [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in head[1:] if line)
+    body = await reader.readexactly(int(response_headers["Content-Length"]))
+    return int(head[0].split(" ")[1]), response_headers, body
+
+
+def test_http_over_socket(test_db_path):
+    path = test_db_path
+    db = sqlite3.connect(path)
+    db.executemany(
+        "INSERT INTO Players (player_id, first_name, last_name, position_code) VALUES (?, 'Connor', ?, 'C')",
+        [(i, f"Player{i}") for i in range(1, 60)]
+    )
+    db.commit()
+    db.close()
+
+    async def run():
+        server = ApiServer(path, workers=1)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            # Several requests on one keep-alive connection
+            status, headers, body = await request(reader, writer, "/players/1")
+            assert status == 200 and json.loads(body)["last_name"] == "Player1"
+            etag = headers["ETag"]
+
+            assert (await request(reader, writer, "/players/1", {"If-None-Match": etag}))[0] == 304
+            assert (await request(reader, writer, "/players/1", {"If-None-Match": f'W/"0", {etag}'}))[0] == 304
+            assert (await request(reader, writer, "/players/1", {"If-None-Match": "*"}))[0] == 304
+            assert (await request(reader, writer, "/players/1", {"If-None-Match": 'W/"0"'}))[0] == 200
+
+            # A matching ETag never hides a missing resource
+            status, headers, _ = await request(reader, writer, "/nope", {"If-None-Match": etag})
+            assert status == 404 and "ETag" not in headers
+            assert (await request(reader, writer, "/players/999", {"If-None-Match": "*"}))[0] == 404
+
+            # Large bodies are gzipped only when the client accepts it
+            status, headers, body = await request(reader, writer, "/players/summary", {"Accept-Encoding": "gzip"})
+            assert status == 200 and headers["Content-Encoding"] == "gzip"
+            assert len(json.loads(gzip.decompress(body))) == 59
+            status, headers, body = await request(reader, writer, "/players/summary")
+            assert "Content-Encoding" not in headers and len(json.loads(body)) == 59
+
+            status, headers, _ = await request(reader, writer, "/standings", {"Connection": "close"})
+            assert status == 200 and headers["Connection"] == "close"
+            assert await reader.read() == b""
+            writer.close()
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.pool.close()
+
+    asyncio.run(run())
@@ -0,0 +1,74 @@
+import database.queries as q
+from database.population_scripts.game_data_helpers import insert_game_data
+
+
+def test_player_combos(test_db):
+    test_db.executemany(
+        "INSERT INTO Players (player_id, first_name, last_name) VALUES (?, ?, ?)",
+        [(97, 'Connor', 'McDavid'), (29, 'Leon', 'Draisaitl'), (2, 'Evan', 'Bouchard')]
+    )
+    skater_rows = [[pid, 1, '20:00', 0, 0, 0, 0, 0, 0, 0, 'EDM'] for pid in (97, 29, 2)]
+    game_row = [1, '2025-10-08', 'EDM', 'CGY', 0, 0]
+    goal_rows = [
+        ['1_1', 1, 29, 1, '01:00', 'pp', None, None],
+        ['1_2', 1, 97, 2, '05:00', 'ev', None, None],
+    ]
+    assist_rows = [[97, 'primary', '1_1'], [2, 'secondary', '1_1'], [29, 'primary', '1_2']]
+
+    # Loading the same game twice must not double count
+    insert_game_data(test_db.cursor(), game_row, skater_rows, [], goal_rows, assist_rows)
+    insert_game_data(test_db.cursor(), game_row, skater_rows, [], goal_rows, assist_rows)
+
+    # player_1, player_2, player_3, team, goals, primary_goals, secondary_goals, ev_goals, pp_goals, sh_goals
+    top = q.get_top_combos(test_db, 'EDM')
+    assert [(row[0], row[2]) + tuple(row[7:]) for row in top] == [
+        (29, 97, 2, 2, 0, 1, 1, 0),
+        (2, 29, 1, 0, 1, 0, 1, 0),
+        (2, 97, 1, 0, 0, 0, 1, 0),
+    ]
+    assert [row[4] for row in q.get_top_combos(test_db, size=3)] == [97]
+    assert q.get_top_combos(test_db, 'CGY') == []
+    assert len(q.get_player_combos(test_db, 2)) == 2
+
+
+def test_combo_lookups_use_index(test_db):
+    # (query, index searches the plan must contain)
+    cases = [
+        (q._top_combos_query('EDM', 2, 10), ["idx_player_combos_team (team_abbrev=? AND size=?)"]),
+        (q._top_combos_query(None, 3, 10), ["idx_player_combos_size (size=?)"]),
+        (q._player_combos_query(97, 2, 10), [
+            "idx_player_combos_player_1 (player_1=? AND size=?)",
+            "idx_player_combos_player_2 (player_2=? AND size=?)",
+        ]),
+        (q._player_combos_query(97, 3, 10), [
+            "idx_player_combos_player_1 (player_1=? AND size=?)",
+            "idx_player_combos_player_2 (player_2=? AND size=?)",
+            "idx_player_combos_player_3 (player_3=? AND size=?)",
+        ]),
+    ]
+    for (sql, params), searches in cases:
+        plan = [row[-1] for row in test_db.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        for search in searches:
+            assert any(step.endswith("USING INDEX " + search) for step in plan), plan
+        assert not any(step.startswith(("SCAN c", "SCAN PlayerCombos")) for step in plan), plan
+
+
+def test_ensure_player_combos_rebuilds_outdated_table(test_db):
+    from database.population_scripts.game_data_helpers import ddl_statements, ensure_player_combos, schema_matches
+
+    db = test_db
+    db.executescript("""
+        DROP TABLE PlayerCombos;
+        CREATE TABLE PlayerCombos (
+            player_1 INTEGER NOT NULL, player_2 INTEGER NOT NULL, player_3 INTEGER NOT NULL DEFAULT 0,
+            team_abbrev TEXT NOT NULL, goals INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_1, player_2, player_3, team_abbrev)
+        );
+    """)
+    db.executemany("INSERT INTO SkaterGameStats (player_id, game_id, team_abbrev) VALUES (?, 1, 'EDM')", [(97,), (29,)])
+    db.execute("INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES ('1_1', 1, 29, 'pp')")
+    db.execute("INSERT INTO Assists (player_id, goal_id, assist_type) VALUES (97, '1_1', 'primary')")
+
+    ensure_player_combos(db.cursor())
+    assert schema_matches(db.cursor(), ddl_statements("PlayerCombos"))
+    assert db.execute("SELECT player_1, player_2, goals, pp_goals FROM PlayerCombos").fetchall() == [(29, 97, 1, 1)]
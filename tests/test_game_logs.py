@@ -0,0 +1,102 @@
+import pytest
+import database.queries as q
+
+
+def test_skater_rolling_stats(test_db):
+    db = test_db
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (?, ?, 'EDM', 'CGY')",
+        [(1, '2025-10-08'), (2, '2025-10-10'), (3, '2025-10-12')]
+    )
+    db.executemany(
+        "INSERT INTO SkaterGameStats (player_id, game_id, toi, shots, plus_minus, team_abbrev) VALUES (97, ?, ?, ?, 0, 'EDM')",
+        [(1, '20:00', 3), (2, '22:30', 4), (3, '19:00', 5)]
+    )
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES (?, ?, 97, 'ev')",
+        [('1_1', 1), ('3_1', 3), ('3_2', 3)]
+    )
+    db.execute("INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES ('2_1', 2, 29, 'pp')")
+    db.execute("INSERT INTO Assists (player_id, goal_id, assist_type) VALUES (97, '2_1', 'primary')")
+
+    logs = q.get_skater_game_logs(db, 97)
+    assert [row[5:8] for row in logs] == [(1, 0, 1), (0, 1, 1), (2, 0, 2)]
+    assert logs[1][9] == 22 * 60 + 30
+
+    rolling = q.get_skater_rolling_stats(db, window=2)
+    # (games_in_window, goals, assists, points) for each game
+    assert [row[3:7] for row in rolling] == [(1, 1, 0, 1), (2, 1, 1, 2), (2, 2, 1, 3)]
+    assert q.get_skater_rolling_stats(db, window=2, latest_only=True)[0][1] == 3
+
+    with pytest.raises(ValueError):
+        q.get_skater_rolling_stats(db, window=0)
+
+
+def test_goalie_rolling_stats(test_db):
+    db = test_db
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (?, ?, 'EDM', 'CGY')",
+        [(1, '2025-10-08'), (2, '2025-10-10'), (3, '2025-10-12'), (4, '2025-10-14')]
+    )
+    # (game_id, started, saves, goals_allowed, shots_against); game 2 is a relief appearance
+    db.executemany(
+        "INSERT INTO GoalieGameStats (player_id, game_id, started, saves, goals_allowed, shots_against, team_abbrev) "
+        "VALUES (74, ?, ?, ?, ?, ?, 'EDM')",
+        [(1, 1, 27, 3, 30), (2, 0, 5, 0, 5), (3, 1, 18, 2, 20), (4, 1, 0, 0, 0)]
+    )
+
+    logs = q.get_goalie_game_logs(db, 74)
+    assert [row[1] for row in logs] == [1, 2, 3, 4]
+    assert logs[0][3:5] == ('EDM', 'CGY')
+
+    # (game_id, games_in_window, saves, goals_allowed, shots_against, save_pct)
+    starts = q.get_goalie_rolling_stats(db, window=2)
+    assert [row[1] for row in starts] == [1, 3, 4]
+    assert starts[1][3:7] == (2, 45, 5, 50)
+    assert starts[1][7] == 0.9
+    assert starts[2][3:7] == (2, 18, 2, 20)
+
+    all_games = q.get_goalie_rolling_stats(db, window=2, starts_only=False)
+    assert [row[6] for row in all_games] == [30, 35, 25, 20]
+
+    # A window with no shots has no save percentage
+    assert q.get_goalie_rolling_stats(db, window=1)[-1][7] is None
+    assert q.get_goalie_rolling_stats(db, window=1, latest_only=True) == [(74, 4, '2025-10-14', 1, 0, 0, 0, None)]
+
+    with pytest.raises(ValueError):
+        q.get_goalie_rolling_stats(db, window=-1)
+
+
+def test_latest_only_skips_partial_windows(test_db):
+    db = test_db
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (?, ?, 'EDM', 'CGY')",
+        [(1, '2025-10-08'), (2, '2025-10-10'), (3, '2025-10-12')]
+    )
+    # 97 plays all three games; 29 and goalie 31 play once, with better numbers
+    db.executemany(
+        "INSERT INTO SkaterGameStats (player_id, game_id, toi, team_abbrev) VALUES (?, ?, '15:00', 'EDM')",
+        [(97, 1), (97, 2), (97, 3), (29, 3)]
+    )
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES (?, ?, ?, 'ev')",
+        [('1_1', 1, 97), ('3_1', 3, 29), ('3_2', 3, 29)]
+    )
+    db.executemany(
+        "INSERT INTO GoalieGameStats (player_id, game_id, started, saves, goals_allowed, shots_against, team_abbrev) "
+        "VALUES (?, ?, 1, ?, ?, ?, 'EDM')",
+        [(74, 1, 27, 3, 30), (74, 2, 18, 2, 20), (31, 3, 30, 0, 30)]
+    )
+
+    assert [row[0] for row in q.get_skater_rolling_stats(db, window=3, latest_only=True)] == [97]
+    assert [row[0] for row in q.get_skater_rolling_stats(db, window=1, latest_only=True)] == [29, 97]
+    assert [row[0] for row in q.get_goalie_rolling_stats(db, window=2, latest_only=True)] == [74]
+    # Full history is still returned without latest_only
+    assert len(q.get_skater_rolling_stats(db, window=3, player_id=29)) == 1
+
+
+def test_player_game_log_uses_index(test_db):
+    cte, params = q._skater_game_log_cte(97)
+    plan = " ".join(row[-1] for row in test_db.execute(f"EXPLAIN QUERY PLAN WITH {cte} SELECT * FROM skater_log", params))
+    assert "SEARCH s USING INDEX sqlite_autoindex_SkaterGameStats_1 (player_id=?)" in plan
+    assert "SCAN" not in plan
@@ -0,0 +1,60 @@
+import database.queries as q
+
+
+def test_search_players(test_db):
+    db = test_db
+    db.execute("INSERT INTO Teams (team_abbrev, team_name) VALUES ('OTT', 'Ottawa Senators')")
+    db.execute("INSERT INTO Players (player_id, first_name, last_name, current_team_abbrev) VALUES (8482116, 'Tim', 'Stützle', 'OTT')")
+    db.execute("INSERT INTO Players (player_id, first_name, last_name, current_team_abbrev) VALUES (8478402, 'Connor', 'McDavid', 'EDM')")
+
+    assert q.search_players(db, "stutzle") == [(8482116, 'Tim', 'Stützle', 'OTT')]
+    assert q.search_players(db, "senators")[0][0] == 8482116
+    assert q.search_players(db, "conn mc")[0][0] == 8478402
+    assert q.search_players(db, "mcdavdi")[0][0] == 8478402
+    assert q.search_players(db, "mcdavdi", fuzzy=False) == []
+    assert q.search_players(db, "xq") == []
+
+    # Upserts from populatePlayers.py must not leave stale or duplicate entries
+    db.execute("INSERT OR REPLACE INTO Players (player_id, first_name, last_name, current_team_abbrev) VALUES (8478402, 'Connor', 'McDavid', 'OTT')")
+    assert q.search_players(db, "mcdavid") == [(8478402, 'Connor', 'McDavid', 'OTT')]
+    # The trigram index holds distinct names, not players
+    assert db.execute("SELECT COUNT(*) FROM PlayerSearchName").fetchone() == (4,)
+    db.execute("DELETE FROM Players WHERE player_id = 8482116")
+    assert q.search_players(db, "stutzle", fuzzy=False) == []
+    assert q.search_players(db, "stutzl") == []
+
+
+def test_ensure_player_search_index(test_db):
+    from database.population_scripts.game_data_helpers import ensure_player_search_index
+
+    db = test_db
+    # The previous layout: one trigram row per player
+    db.executescript("""
+        DROP TRIGGER players_search_ai;
+        DROP TRIGGER players_search_au;
+        DROP TRIGGER players_search_ad;
+        DROP TRIGGER player_search_name_ai;
+        DROP TABLE PlayerSearchTrigramVocab;
+        DROP TABLE PlayerSearchTrigram;
+        DROP TABLE PlayerSearchName;
+        CREATE VIRTUAL TABLE PlayerSearchTrigram USING fts5(name, tokenize = 'trigram');
+    """)
+    db.execute("INSERT INTO Players (player_id, first_name, last_name) VALUES (8477934, 'Leon', 'Draisaitl')")
+
+    ensure_player_search_index(db.cursor())
+    ensure_player_search_index(db.cursor())
+    assert q.search_players(db, "draisatl") == [(8477934, 'Leon', 'Draisaitl', None)]
+    db.execute("INSERT INTO Players (player_id, first_name, last_name) VALUES (8478402, 'Connor', 'McDavid')")
+    assert q.search_players(db, "mcdavid")[0][0] == 8478402
+
+
+def test_close_terms_keep_exact_name(test_db):
+    # More near-identical names than the old top-20 bm25 cutoff, all longer than the real one
+    test_db.executemany(
+        "INSERT INTO Players (player_id, first_name, last_name) VALUES (?, 'Connor', ?)",
+        [(i, f"McDavidson{chr(97 + i % 26)}{i}") for i in range(1, 41)]
+    )
+    test_db.execute("INSERT INTO Players (player_id, first_name, last_name) VALUES (8478402, 'Connor', 'McDavid')")
+
+    assert q._close_terms(test_db, "mcdavdi")[0] == "mcdavid"
+    assert q.search_players(test_db, "mcdavdi")[0][0] == 8478402
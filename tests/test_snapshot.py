@@ -0,0 +1,71 @@
+import os
+from database.population_scripts.snapshot import build_snapshot, Snapshot
+
+
+def test_snapshot_aggregate(test_db, tmp_path):
+    db = test_db
+    db.executemany("INSERT INTO Teams (team_abbrev, team_name) VALUES (?, ?)", [('EDM', 'Edmonton Oilers'), ('CGY', 'Calgary Flames')])
+    db.executemany("INSERT INTO Players (player_id, first_name, last_name) VALUES (?, '', '')", [(97,), (29,), (23,)])
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (?, ?, 'EDM', 'CGY')",
+        [(1, '2025-10-08'), (2, '2025-11-02')]
+    )
+    db.executemany(
+        "INSERT INTO SkaterGameStats (player_id, game_id, toi, shots, team_abbrev) VALUES (?, ?, ?, ?, ?)",
+        [(97, 1, '20:00', 4, 'EDM'), (97, 2, '21:30', 6, 'EDM'), (29, 1, '19:00', 2, 'EDM'), (23, 2, '18:00', 3, 'CGY')]
+    )
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES (?, ?, ?, ?)",
+        [('1_1', 1, 97, 'pp'), ('1_2', 1, 29, 'ev'), ('2_1', 2, 97, 'ev'), ('2_2', 2, 23, 'pp')]
+    )
+    db.execute("INSERT INTO Assists (player_id, goal_id, assist_type) VALUES (29, '1_1', 'primary')")
+
+    path = str(tmp_path / "snapshot")
+    build_snapshot(db, path)
+    build_snapshot(db, path)  # rebuilding replaces the old snapshot
+    snap = Snapshot(path)
+
+    assert snap.aggregate("goals", by="player") == [(97, 2), (23, 1), (29, 1)]
+    assert snap.aggregate("goals", by="team", goal_type="pp") == [('CGY', 1), ('EDM', 1)]
+    assert snap.aggregate("skaters", by="player", metrics=("shots", "toi_seconds"), start="2025-11-01") == [
+        (97, 6, 21 * 60 + 30),
+        (23, 3, 18 * 60),
+    ]
+    assert snap.aggregate("skaters", metrics=("count", "shots"), player=97) == [(2, 10)]
+    assert snap.aggregate("assists", by="player", metrics=("count", "is_primary")) == [(29, 1, 1)]
+    assert snap.aggregate("games", metrics=("count",), team="CGY") == [(2,)]
+
+
+def test_snapshot_survives_rebuild(test_db, tmp_path):
+    db = test_db
+    db.executemany("INSERT INTO Teams (team_abbrev, team_name) VALUES (?, ?)", [('EDM', 'Edmonton Oilers'), ('CGY', 'Calgary Flames')])
+    db.executemany("INSERT INTO Players (player_id, first_name, last_name) VALUES (?, '', '')", [(97,), (29,)])
+    db.execute("INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (1, '2025-10-08', 'EDM', 'CGY')")
+    db.execute("INSERT INTO SkaterGameStats (player_id, game_id, toi, team_abbrev) VALUES (97, 1, '20:00', 'EDM')")
+    db.execute("INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES ('1_1', 1, 97, 'ev')")
+
+    path = str(tmp_path / "snapshot")
+    build_snapshot(db, path)
+    old = Snapshot(path)
+    assert old.aggregate("goals", by="player") == [(97, 1)]
+
+    # A new player and more goals change every encoded column's length and codes
+    db.execute("INSERT INTO Players (player_id, first_name, last_name) VALUES (8, '', '')")
+    db.execute("INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (2, '2025-10-10', 'CGY', 'EDM')")
+    db.execute("INSERT INTO SkaterGameStats (player_id, game_id, toi, team_abbrev) VALUES (8, 2, '18:00', 'CGY')")
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES (?, 2, 8, 'pp')",
+        [('2_1',), ('2_2',)]
+    )
+    build_snapshot(db, path)
+    build_snapshot(db, path)  # the old build's directory is gone now
+
+    # The open snapshot still answers from its own build, including columns not read before
+    assert old.aggregate("goals", by="player") == [(97, 1)]
+    assert old.aggregate("goals", by="team") == [('EDM', 1)]
+    assert old.aggregate("goals", metrics=("count",), goal_type="pp") == [(0,)]
+
+    new = Snapshot(path)
+    assert new.aggregate("goals", by="player") == [(8, 2), (97, 1)]
+    assert new.aggregate("goals", by="team") == [('CGY', 2), ('EDM', 1)]
+    assert sorted(os.listdir(path)) == ["2", "3", "CURRENT"]
@@ -0,0 +1,27 @@
+import database.queries as q
+
+
+def test_get_standings(test_db):
+    db = test_db
+    db.executemany("INSERT INTO Teams (team_abbrev, team_name) VALUES (?, ?)", [('EDM', 'Edmonton Oilers'), ('CGY', 'Calgary Flames')])
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev, ot) VALUES (?, ?, 'EDM', 'CGY', ?)",
+        [(1, '2025-10-08', 0), (2, '2025-10-10', 1)]
+    )
+    db.executemany(
+        "INSERT INTO SkaterGameStats (player_id, game_id, team_abbrev) VALUES (?, ?, ?)",
+        [(97, 1, 'EDM'), (97, 2, 'EDM'), (23, 1, 'CGY'), (23, 2, 'CGY')]
+    )
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, period) VALUES (?, ?, ?, ?)",
+        [('1_1', 1, 97, 1), ('1_2', 1, 97, 2), ('2_1', 2, 97, 1), ('2_2', 2, 23, 2), ('2_3', 2, 23, 4)]
+    )
+
+    standings = q.get_standings(db)
+    # team, games_played, wins, losses, ot_losses, points, goals_for, goals_against
+    assert [(row[0],) + tuple(row[4:]) for row in standings] == [
+        ('EDM', 2, 1, 0, 1, 3, 3, 2),
+        ('CGY', 2, 1, 1, 0, 2, 2, 3),
+    ]
+    assert q.get_game_box_score(db, 2)["game"][4:6] == (1, 2)
+    assert q.get_game_box_score(db, 3) is None
@@ -0,0 +1,33 @@
+import database.queries as q
+
+
+def test_player_summary_counts_each_row_once(test_db):
+    db = test_db
+    db.execute("INSERT INTO Teams (team_abbrev, team_name) VALUES ('BOS', 'Boston Bruins')")
+    db.executemany(
+        "INSERT INTO Players (player_id, first_name, last_name, position_code, current_team_abbrev) VALUES (?, ?, ?, ?, 'BOS')",
+        [(39, 'Morgan', 'Geekie', 'C'), (88, 'David', 'Pastrnak', 'R'), (35, 'Jeremy', 'Swayman', 'G')]
+    )
+    db.executemany(
+        "INSERT INTO Games (game_id, game_date, home_team_abbrev, away_team_abbrev) VALUES (?, ?, 'BOS', 'BOS')",
+        [(1, '2025-10-08'), (2, '2025-10-10')]
+    )
+    db.executemany(
+        "INSERT INTO SkaterGameStats (player_id, game_id, penalty_minutes, faceoff_wins, faceoff_losses, shots, hits, blocks, team_abbrev) "
+        "VALUES (?, ?, ?, 5, 4, ?, 1, 2, 'BOS')",
+        [(39, 1, 2, 4), (39, 2, 0, 3), (88, 1, 0, 6)]
+    )
+    db.executemany(
+        "INSERT INTO Goals (goal_id, game_id, player_id, goal_type) VALUES (?, ?, 39, ?)",
+        [('1_1', 1, 'pp'), ('1_2', 1, 'ev'), ('1_3', 1, 'sh'), ('2_1', 2, 'ev')]
+    )
+    db.executemany(
+        "INSERT INTO Assists (player_id, goal_id, assist_type) VALUES (?, ?, 'primary')",
+        [(88, '1_1'), (88, '1_2'), (39, '1_1')]
+    )
+
+    rows = q.get_all_player_summary_stats(db)
+    assert [row[1] for row in rows] == ['Geekie', 'Pastrnak']
+    # games_played .. blocks
+    assert rows[0][6:] == (2, 4, 1, 1, 1, 1, 0, 2, 10, 8, 1, 7, 2, 4)
+    assert rows[1][6:] == (1, 0, 2, 0, 0, 1, 0, 0, 5, 4, 0, 6, 1, 2)